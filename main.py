@@ -1,51 +1,213 @@
 import streamlit as st
-import os
+import hashlib
+import random
+import openai
 from openai import OpenAI
-import fitz
-import io
+import tiktoken
 import time
-import pandas as pd
+import concurrent.futures
+import threading
+import functools
+import json
 import re
-import plotly.graph_objs as go
-from typing import Dict, Any, List
+from dataclasses import dataclass
+from typing import Dict, Any, List, Callable, Optional, Tuple
 
-class VeteranVCAnalyzer:
-    def __init__(self):
-        # API 키 설정 및 클라이언트 초기화
-        self.api_key = self._load_api_key()
-        self.client = self._initialize_openai_client()
 
-    def _load_api_key(self) -> str:
-        """API 키를 안전하게 로드하는 메서드"""
-        api_key = st.secrets.get("OPENAI_API_KEY")
-        if not api_key:
-            st.error("OpenAI API 키를 찾을 수 없습니다. Streamlit Cloud Secrets 설정을 확인하세요.")
-            st.stop()
-        return api_key
+@st.cache_resource(show_spinner=False)
+def get_openai_client(api_key: str) -> OpenAI:
+    """재실행(rerun)마다 새로 만들지 않도록 OpenAI 클라이언트를 캐시"""
+    # 재시도는 _call_with_backoff 한 곳에서만 하도록 SDK 자체 재시도는 끔
+    return OpenAI(api_key=api_key, max_retries=0)
 
-    def _initialize_openai_client(self) -> OpenAI:
-        """OpenAI 클라이언트를 초기화하는 메서드"""
+
+MAX_PDF_BYTES = 25 * 1024 * 1024
+MAX_PDF_PAGES = 300
+HEAD_PAGES = 200
+TAIL_PAGES = 50
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def extract_text_cached(file_bytes: bytes) -> Tuple[str, int]:
+    """PDF 바이트에서 텍스트를 추출 (바이트 해시 기준으로 캐시)
+
+    (추출한 텍스트, 전체 페이지 수)를 반환하며, MAX_PDF_PAGES를 넘는 문서는
+    앞 HEAD_PAGES 페이지와 뒤 TAIL_PAGES 페이지만 읽습니다.
+    """
+    import fitz
+
+    with fitz.open(stream=file_bytes, filetype="pdf") as doc:
+        page_count = doc.page_count
+        if page_count > MAX_PDF_PAGES:
+            pages = list(range(HEAD_PAGES)) + list(range(page_count - TAIL_PAGES, page_count))
+        else:
+            pages = range(page_count)
+
+        # 레이아웃 정렬/공백 보존 없이 원시 텍스트만 추출하고, 텍스트가 없는 페이지는 건너뜀
+        parts = []
+        for i in pages:
+            text = doc[i].get_text("text", flags=fitz.TEXT_MEDIABOX_CLIP, sort=False)
+            if text:
+                parts.append(text)
+    return "\n".join(parts), page_count
+
+
+class StreamInterruptedError(Exception):
+    """스트리밍 응답을 읽는 도중 발생한 오류 (재시도 대상)
+
+    스트림 도중 끊기면 SDK 예외로 감싸지지 않은 HTTP 클라이언트 예외가 그대로 올라오므로,
+    클라이언트 구현에 의존하지 않도록 이 예외로 감싸서 재시도합니다.
+    """
+
+
+class AnalysisCancelledError(Exception):
+    """사용자가 분석을 취소해 스트리밍을 중단했을 때 발생 (재시도/캐시 대상 아님)"""
+
+
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.APITimeoutError,
+                    StreamInterruptedError)
+
+
+def _call_with_backoff(fn, *args, retries=6, base=2.0, cancel_event: Optional[threading.Event] = None, **kwargs):
+    """429/일시적 5xx 오류 시 지수 백오프(+지터)로 재시도하는 래퍼
+
+    cancel_event가 주어지면 대기 중에 취소되었을 때 바로 깨어나 다음 시도에서 중단되도록 합니다.
+    """
+    for attempt in range(retries):
         try:
-            return OpenAI(api_key=self.api_key)
-        except Exception as e:
-            st.error(f"OpenAI 클라이언트 초기화 오류: {e}")
-            st.stop()
+            return fn(*args, **kwargs)
+        except openai.APIStatusError as e:
+            # RateLimitError(429)는 APIStatusError의 하위 클래스
+            if not isinstance(e, openai.RateLimitError) and e.status_code < 500:
+                raise
+            if attempt == retries - 1:
+                raise
+        except RETRYABLE_ERRORS:
+            if attempt == retries - 1:
+                raise
+        delay = random.uniform(base, 2 * base) * (2 ** attempt)
+        if cancel_event is not None:
+            cancel_event.wait(delay)
+        else:
+            time.sleep(delay)
+
+
+@st.cache_resource(show_spinner=False)
+def get_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """분석 작업을 처리하는 백그라운드 스레드 풀 (세션 간 공유)"""
+    return concurrent.futures.ThreadPoolExecutor(max_workers=4)
+
+
+MAX_PLAN_TOKENS = 12000
+HEAD_TOKENS = 8000
+TAIL_TOKENS = 4000
+# 토크나이저를 쓸 수 없을 때 사용하는 대략적인 환산 비율 (글자 수 = 토큰 수 × 2)
+CHARS_PER_TOKEN = 2
+TRUNCATION_MARKER = "\n...[중략]...\n"
+
+
+@st.cache_resource(show_spinner=False)
+def get_encoder() -> tiktoken.Encoding:
+    """GPT-4o 토크나이저 (로딩 비용이 있어 한 번만 생성)"""
+    return tiktoken.encoding_for_model("gpt-4o")
+
+
+def truncate_to_token_limit(text: str, max_tokens: int = MAX_PLAN_TOKENS) -> str:
+    """토큰 수가 한도를 넘으면 앞/뒤 부분만 남기고 가운데를 생략
+
+    토크나이저를 불러오지 못하면(최초 실행 시 BPE 파일 다운로드 실패 등) 글자 수 기준으로 자릅니다.
+    """
+    try:
+        enc = get_encoder()
+    except Exception:
+        if len(text) <= max_tokens * CHARS_PER_TOKEN:
+            return text
+        return (text[:HEAD_TOKENS * CHARS_PER_TOKEN] + TRUNCATION_MARKER
+                + text[-TAIL_TOKENS * CHARS_PER_TOKEN:])
+
+    tokens = enc.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    truncated = tokens[:HEAD_TOKENS] + enc.encode(TRUNCATION_MARKER) + tokens[-TAIL_TOKENS:]
+    return enc.decode(truncated)
+
+
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=32)
+def _cached_feedback(_client: OpenAI, text_hash: str, prompt_version: str, model: str, temperature: float,
+                     _system_prompt: str, _prompt: str,
+                     _on_update: Optional[Callable[[List[str]], None]] = None,
+                     _cancel_event: Optional[threading.Event] = None) -> str:
+    """동일한 (텍스트 해시, 프롬프트 버전, 모델, temperature) 조합의 GPT 호출 결과를 캐시
+
+    사업계획서 전체가 들어 있는 프롬프트는 _ 인자로 넘겨 캐시 키 해싱에서 제외합니다.
+
+    캐시 미스일 때는 응답을 스트리밍으로 받으며, 조각이 쌓이는 리스트를 _on_update로 전달합니다.
+    (토큰마다 전체를 다시 이어 붙이지 않도록, 이어 붙이기는 화면을 갱신하는 쪽에서 합니다.)
+    _cancel_event가 설정되면 스트림을 닫고 AnalysisCancelledError를 발생시킵니다.
+    """
+    def cancelled() -> bool:
+        return _cancel_event is not None and _cancel_event.is_set()
+
+    def stream_completion() -> List[str]:
+        # 요청 생성과 스트림 소비를 하나의 재시도 단위로 묶어, 스트리밍 도중 끊겨도 처음부터 다시 받음
+        if cancelled():
+            raise AnalysisCancelledError("분석이 취소되었습니다.")
+        response = _client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": _system_prompt},
+                {"role": "user", "content": _prompt}
+            ],
+            max_tokens=4000,
+            temperature=temperature,
+            response_format={"type": "json_object"},
+            stream=True
+        )
 
-    def extract_text_from_pdf(self, uploaded_file) -> str:
-        """PDF에서 텍스트를 추출하는 메서드"""
+        buf = []
+        if _on_update is not None:
+            _on_update(buf)
+        finish_reason = None
         try:
-            file_bytes = uploaded_file.getvalue()
-            with fitz.open(stream=file_bytes, filetype="pdf") as doc:
-                full_text = "".join(page.get_text() for page in doc)
-            return full_text
+            for chunk in response:
+                if cancelled():
+                    break
+                if not chunk.choices:
+                    continue
+                buf.append(chunk.choices[0].delta.content or "")
+                finish_reason = chunk.choices[0].finish_reason or finish_reason
         except Exception as e:
-            st.error(f"PDF 처리 오류: {e}")
-            st.warning("텍스트 기반 PDF인지, 파일 손상 여부를 확인해주세요.")
-            return None
+            raise StreamInterruptedError(f"스트리밍 응답 수신 중 연결이 끊겼습니다: {e}") from e
 
-    def generate_ai_feedback(self, business_plan_text: str) -> str:
-        """AI를 통해 사업계획서 심층 피드백을 생성하는 메서드"""
-        prompt = f"""
+        if cancelled():
+            # 연결을 닫아 더 이상 토큰이 생성/과금되지 않도록 함
+            response.close()
+            raise AnalysisCancelledError("분석이 취소되었습니다.")
+
+        # 토큰 한도에서 잘린 JSON은 파싱할 수 없으므로 캐시하지 않고 오류로 처리
+        if finish_reason == "length":
+            raise ValueError("응답이 최대 토큰 수에 도달해 잘렸습니다. 다시 시도해주세요.")
+        return buf
+
+    buf = _call_with_backoff(stream_completion, cancel_event=_cancel_event)
+
+    feedback = "".join(buf)
+    if not feedback:
+        raise ValueError("OpenAI 응답이 비어 있습니다.")
+    return feedback
+
+
+@dataclass(frozen=True)
+class Rubric:
+    """분석 모드별 프롬프트와 평가 영역(만점 포함) 정의"""
+    name: str
+    system_prompt: str
+    prompt_prefix: str
+    categories: Tuple[str, ...]
+    max_scores: Tuple[int, ...]
+
+
+VC_PROMPT_PREFIX = """
         [극단적 정밀성의 벤처캐피털 심사 프레임워크]
 
         평가 배경: 2025년 현재, 글로벌 벤처투자 시장은 전례 없는 엄격성과 선별성을 요구하고 있습니다. 
@@ -111,78 +273,286 @@ class VeteranVCAnalyzer:
         - 구체적인 개선 방안 제시
         - 투자 결정에 직접적인 인사이트 제공
         - 글로벌 스탠다드 관점에서의 평가
+        """
+
+
+VC_RUBRIC = Rubric(
+    name="베테랑 VC 심층 분석",
+    system_prompt="당신은 25년 경력의 글로벌 벤처캐피털 파트너입니다. 극도로 정밀하고 엄격한 투자 심사 접근법을 사용합니다.",
+    prompt_prefix=VC_PROMPT_PREFIX,
+    categories=(
+        '명확성 및 논리성', '시장 분석', '사업 모델',
+        '실행 계획', '재무 계획', '기술/제품 차별성', '팀의 역량'
+    ),
+    max_scores=(20, 25, 20, 15, 15, 10, 5)
+)
+
+RUBRICS = [VC_RUBRIC]
+
+
+@functools.lru_cache(maxsize=None)
+def build_static_prompt(rubric: Rubric) -> str:
+    """사업계획서 본문 앞에 붙는 정적 프롬프트 (JSON 출력 형식 포함)
+
+    호출마다 바이트 단위로 동일한 접두어가 되도록 한 번만 만들고, 가변적인 사업계획서
+    본문은 항상 맨 뒤에 붙입니다. OpenAI는 1024토큰 이상의 동일한 접두어를 자동으로
+    캐시해 입력 토큰 비용을 할인합니다.
+    """
+    # overall을 먼저 스트리밍받아야 영역별 점수를 작성하는 동안에도 읽을 수 있는 내용이 바로 표시됨
+    schema = {
+        "overall": "종합 평가 및 구체적인 개선 방안 (마크다운)",
+        "scores": {
+            category: {"score": 0, "max": max_score, "details": "..."}
+            for category, max_score in zip(rubric.categories, rubric.max_scores)
+        }
+    }
+    return (
+        f"{rubric.prompt_prefix}"
+        f"\n반드시 JSON으로 출력 (overall을 scores보다 먼저 작성): {json.dumps(schema, ensure_ascii=False)}\n"
+        "\n[사업계획서 내용]\n"
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def prompt_version(rubric: Rubric) -> str:
+    """시스템 프롬프트와 정적 프롬프트의 짧은 해시 (피드백 캐시 키로 사용)"""
+    static = rubric.system_prompt + build_static_prompt(rubric)
+    return hashlib.blake2b(static.encode(), digest_size=16).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _score_patterns(categories: Tuple[str, ...]) -> Tuple["re.Pattern[str]", "re.Pattern[str]"]:
+    """(점수 줄 패턴, 세부 내용 이어짐 패턴)을 반환
+
+    DOTALL로 본문 전체를 가로지르며 백트래킹하지 않도록 두 패턴 모두 한 줄 단위로 매칭합니다.
+    점수 줄 패턴은 (영역명, 점수, 만점, 같은 줄의 나머지)를, 이어짐 패턴은 점수 줄 뒤에서
+    빈 줄/번호 줄/다른 영역 줄이 나오기 전까지의 줄들을 잡습니다.
+    """
+    alternation = "|".join(re.escape(category) for category in categories)
+    score_line = re.compile(
+        rf"^[^\n]*?({alternation})[^\n]*?(\d+(?:\.\d+)?)[^\S\n]*/[^\S\n]*(\d+)[^\S\n]*([^\n]*)",
+        re.MULTILINE
+    )
+    continuation = re.compile(
+        rf"(?:\n(?![^\S\n]*(?:\n|$)|\d|[^\n]*(?:{alternation}))[^\n]*)*"
+    )
+    return score_line, continuation
+
+
+def _load_feedback_json(feedback_text: str) -> Optional[Dict[str, Any]]:
+    """JSON 모드로 받은 피드백을 파싱 (JSON이 아니면 None)"""
+    try:
+        data = json.loads(feedback_text)
+    except json.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+_OVERALL_START = re.compile(r'"overall"\s*:\s*"')
+_UNESCAPED_QUOTE = re.compile(r'(?<!\\)(?:\\\\)*"')
+
+
+def partial_overall(partial_json: str) -> Optional[str]:
+    """스트리밍 중인(아직 닫히지 않은) JSON에서 overall 문자열을 지금까지 받은 만큼 추출"""
+    start = _OVERALL_START.search(partial_json)
+    if start is None:
+        return None
+    raw = partial_json[start.end():]
+    end = _UNESCAPED_QUOTE.search(raw)
+    if end is not None:
+        raw = raw[:end.end() - 1]
+    # 끝부분에 잘린 이스케이프(\ 또는 \uXXXX 일부)가 있으면 최대 5글자까지 버리고 디코딩
+    for cut in range(6):
+        try:
+            return json.loads(f'"{raw[:len(raw) - cut]}"')
+        except json.JSONDecodeError:
+            continue
+    return None
+
 
-        [사업계획서 내용]
-        {business_plan_text}
+class Analyzer:
+    def __init__(self, rubric: Rubric):
+        self.rubric = rubric
+        # API 키 설정 및 클라이언트 초기화
+        self.api_key = self._load_api_key()
+        self.client = self._initialize_openai_client()
+
+    def _load_api_key(self) -> str:
+        """API 키를 안전하게 로드하는 메서드"""
+        api_key = st.secrets.get("OPENAI_API_KEY")
+        if not api_key:
+            st.error("OpenAI API 키를 찾을 수 없습니다. Streamlit Cloud Secrets 설정을 확인하세요.")
+            st.stop()
+        return api_key
+
+    def _initialize_openai_client(self) -> OpenAI:
+        """OpenAI 클라이언트를 초기화하는 메서드"""
+        try:
+            return get_openai_client(self.api_key)
+        except Exception as e:
+            st.error(f"OpenAI 클라이언트 초기화 오류: {e}")
+            st.stop()
+
+    def extract_text_from_pdf(self, file_bytes: bytes) -> Tuple[str, int]:
+        """PDF에서 텍스트를 추출하는 메서드 (텍스트, 전체 페이지 수)"""
+        return extract_text_cached(file_bytes)
+
+    def generate_ai_feedback(self, business_plan_text: str,
+                             on_update: Optional[Callable[[List[str]], None]] = None,
+                             cancel_event: Optional[threading.Event] = None) -> str:
+        """AI를 통해 사업계획서 심층 피드백을 생성하는 메서드"""
+        prompt = build_static_prompt(self.rubric) + business_plan_text
+
+        text_hash = hashlib.blake2b(business_plan_text.encode(), digest_size=16).hexdigest()
+
+        return _cached_feedback(
+            self.client, text_hash, prompt_version(self.rubric), "gpt-4o", 0.5,
+            _system_prompt=self.rubric.system_prompt, _prompt=prompt,
+            _on_update=on_update, _cancel_event=cancel_event
+        )
+
+    def run_pipeline(self, file_bytes: bytes, progress: Dict[str, Any]) -> Dict[str, str]:
+        """PDF 추출부터 AI 피드백 생성까지 수행하는 메서드 (백그라운드 스레드에서 실행)
+
+        작업 스레드에서는 Streamlit 요소를 그릴 수 없으므로 스트리밍 중인 텍스트는
+        progress['parts']에 기록하고, 오류는 결과 딕셔너리로 돌려줍니다.
+        progress['cancel'] 이벤트가 설정되면 스트리밍을 중단합니다.
         """
+        try:
+            business_plan_text, page_count = self.extract_text_from_pdf(file_bytes)
+        except Exception as e:
+            return {
+                'error': f"PDF 처리 오류: {e}",
+                'warning': "텍스트 기반 PDF인지, 파일 손상 여부를 확인해주세요."
+            }
+
+        if not business_plan_text:
+            return {'warning': "PDF에서 텍스트를 추출하지 못했습니다."}
+
+        # 긴 사업계획서는 토큰 한도에 맞게 미리 줄여 비용과 지연을 제한
+        business_plan_text = truncate_to_token_limit(business_plan_text)
+
+        def on_update(parts: List[str]):
+            progress['parts'] = parts
 
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "당신은 25년 경력의 글로벌 벤처캐피털 파트너입니다. 극도로 정밀하고 엄격한 투자 심사 접근법을 사용합니다."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=4000,
-                temperature=0.5
+            feedback = self.generate_ai_feedback(
+                business_plan_text, on_update=on_update, cancel_event=progress['cancel']
             )
-            return response.choices[0].message.content
+        except AnalysisCancelledError as e:
+            return {'warning': str(e)}
         except Exception as e:
-            st.error(f"AI 피드백 생성 중 오류: {e}")
-            return None
+            return {'error': f"AI 피드백 생성 중 오류: {e}"}
+
+        result = {'feedback': feedback}
+        if page_count > MAX_PDF_PAGES:
+            result['warning'] = (
+                f"{page_count}페이지 PDF는 너무 길어 앞 {HEAD_PAGES}페이지와 "
+                f"뒤 {TAIL_PAGES}페이지만 분석했습니다."
+            )
+        return result
 
     def parse_detailed_scores(self, feedback_text: str) -> Dict[str, Dict[str, Any]]:
-        """피드백 텍스트에서 점수와 세부 평가 내용을 추출하는 고급 메서드"""
+        """피드백에서 점수와 세부 평가 내용을 추출하는 메서드
+
+        JSON 응답이면 그대로 읽고, JSON 파싱에 실패하면 정규식 추출로 대체합니다.
+        """
+        data = _load_feedback_json(feedback_text)
+        if data is not None and isinstance(data.get('scores'), dict):
+            found = self._scores_from_json(data['scores'])
+        else:
+            found = self._scores_from_text(feedback_text)
+
         scores = {}
-        categories = [
-            '명확성 및 논리성', '시장 분석', '사업 모델',
-            '실행 계획', '재무 계획', '기술/제품 차별성', '팀의 역량'
-        ]
-
-        for category in categories:
-            # 점수 추출
-            score_pattern = re.compile(rf"{category}.*?(\d+(?:\.\d+)?)/(\d+)", re.DOTALL)
-            score_match = score_pattern.search(feedback_text)
-
-            # 세부 평가 내용 추출
-            detail_pattern = re.compile(rf"{category}.*?(\d+(?:\.\d+)?)/\d+\s*(.+?)(?=\n\n|\n\d|\Z)", re.DOTALL | re.MULTILINE)
-            detail_match = detail_pattern.search(feedback_text)
-
-            if score_match and detail_match:
-                score = float(score_match.group(1))
-                max_score = int(score_match.group(2))
-                detail = detail_match.group(2).strip()
-
-                scores[category] = {
-                    'score': score,
-                    'max_score': max_score,
-                    'details': detail
-                }
-            else:
-                scores[category] = {
-                    'score': 0.0,
-                    'max_score': 20,
-                    'details': '평가 정보 없음'
-                }
+        for category, max_score in zip(self.rubric.categories, self.rubric.max_scores):
+            scores[category] = found.get(category, {
+                'score': 0.0,
+                'max_score': max_score,
+                'details': '평가 정보 없음'
+            })
 
         return scores
 
+    def _scores_from_json(self, raw_scores: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """JSON 응답의 scores 항목을 내부 점수 형식으로 변환"""
+        found = {}
+        for category, max_score in zip(self.rubric.categories, self.rubric.max_scores):
+            item = raw_scores.get(category)
+            if not isinstance(item, dict):
+                continue
+            try:
+                found[category] = {
+                    'score': float(item['score']),
+                    'max_score': int(item.get('max', max_score)),
+                    'details': str(item.get('details', '')).strip()
+                }
+            except (KeyError, TypeError, ValueError):
+                continue
+        return found
+
+    def _scores_from_text(self, feedback_text: str) -> Dict[str, Dict[str, Any]]:
+        """자유 형식 텍스트에서 정규식으로 점수를 추출 (JSON 파싱 실패 시 대체 경로)"""
+        score_line, continuation = _score_patterns(self.rubric.categories)
+        found = {}
+        for match in score_line.finditer(feedback_text):
+            category = match.group(1)
+            # 같은 영역이 여러 번 언급되면 처음 나온 점수를 사용
+            if category in found:
+                continue
+            rest = continuation.match(feedback_text, match.end()).group(0)
+            found[category] = {
+                'score': float(match.group(2)),
+                'max_score': int(match.group(3)),
+                'details': (match.group(4) + rest).strip()
+            }
+        return found
+
+    def report_markdown(self, feedback_text: str) -> str:
+        """화면에 표시할 종합 평가 본문 (JSON이 아니면 원문 그대로)"""
+        data = _load_feedback_json(feedback_text)
+        if data is None:
+            return feedback_text
+        return str(data.get('overall', ''))
+
     def visualize_scores(self, scores: Dict[str, Dict[str, Any]]):
         """인터랙티브하고 풍부한 Plotly 시각화"""
+        # plotly/pandas는 import 비용이 커서 결과를 그릴 때만 로드
+        import pandas as pd
+        import plotly.graph_objs as go
+        from plotly.subplots import make_subplots
+
         categories = list(scores.keys())
         values = [score_data['score'] for score_data in scores.values()]
         max_scores = [score_data['max_score'] for score_data in scores.values()]
 
+        # 레이더 차트와 막대 그래프를 하나의 Figure로 묶어 브라우저에서 Plotly를 한 번만 초기화
+        fig = make_subplots(
+            rows=1, cols=2,
+            specs=[[{"type": "polar"}, {"type": "xy"}]],
+            subplot_titles=('다차원 평가', '영역별 점수')
+        )
+
         # 레이더 차트
-        fig_radar = go.Figure(data=go.Scatterpolar(
+        fig.add_trace(go.Scatterpolar(
             r=values,
             theta=categories,
             fill='toself',
             line_color='rgba(0, 128, 255, 0.7)',
-            fillcolor='rgba(0, 128, 255, 0.3)'
-        ))
+            fillcolor='rgba(0, 128, 255, 0.3)',
+            name='다차원 평가'
+        ), row=1, col=1)
 
-        fig_radar.update_layout(
+        # 막대 그래프
+        fig.add_trace(go.Bar(
+            x=categories,
+            y=values,
+            marker_color='rgba(58, 71, 80, 0.6)',
+            text=[f'{v:.1f}/{max_scores[i]}' for i, v in enumerate(values)],
+            textposition='auto',
+            name='영역별 점수'
+        ), row=1, col=2)
+
+        fig.update_layout(
             title='사업계획서 다차원 평가 분석',
             polar=dict(
                 radialaxis=dict(
@@ -190,31 +560,16 @@ class VeteranVCAnalyzer:
                     range=[0, max(max_scores)]
                 )
             ),
-            height=600
+            showlegend=False,
+            height=600,
+            # 다른 위젯이 바뀌어도 사용자 시점(줌 등)을 유지
+            uirevision="fixed"
         )
+        fig.update_xaxes(title_text='평가 영역', row=1, col=2)
+        fig.update_yaxes(title_text='점수', range=[0, max(max_scores)], row=1, col=2)
 
-        # 막대 그래프
-        fig_bar = go.Figure(data=[
-            go.Bar(
-                x=categories,
-                y=values,
-                marker_color='rgba(58, 71, 80, 0.6)',
-                text=[f'{v:.1f}/{max_scores[i]}' for i, v in enumerate(values)],
-                textposition='auto',
-            )
-        ])
-
-        fig_bar.update_layout(
-            title='평가 영역별 점수 상세 분석',
-            xaxis_title='평가 영역',
-            yaxis_title='점수',
-            yaxis_range=[0, max(max_scores)],
-            height=500
-        )
-
-        # Streamlit에 차트 표시
-        st.plotly_chart(fig_radar, use_container_width=True)
-        st.plotly_chart(fig_bar, use_container_width=True)
+        # Streamlit에 차트 표시 (막대 그래프의 정확한 점수 확인을 위해 인터랙티브 유지)
+        st.plotly_chart(fig, width="stretch")
 
         # 세부 점수 및 평가 내용 테이블
         st.subheader("📊 평가 영역별 상세 점수 및 평가")
@@ -227,7 +582,27 @@ class VeteranVCAnalyzer:
             })
 
         score_df = pd.DataFrame(score_details)
-        st.table(score_df)
+        # 긴 텍스트 셀은 정적 HTML 테이블 대신 가상화된 그리드로 표시
+        st.dataframe(
+            score_df,
+            width="stretch",
+            hide_index=True,
+            column_config={"평가 세부 내용": st.column_config.TextColumn(width="large")}
+        )
+
+def render_analysis_result(analyzer: Analyzer, feedback: str, scores: Dict[str, Dict[str, Any]]):
+    """세션에 저장된 분석 결과를 화면에 표시"""
+    st.header("💡 투자 심층 분석 결과")
+    st.markdown(analyzer.report_markdown(feedback))
+
+    st.markdown("---")
+
+    # 점수 시각화
+    st.header("📊 다차원 투자 평가")
+    if scores:
+        analyzer.visualize_scores(scores)
+    else:
+        st.warning("점수 추출에 실패했습니다.")
 
 def main():
     st.set_page_config(
@@ -246,40 +621,83 @@ def main():
         help="정확한 분석을 위해 명확한 텍스트 기반 PDF를 권장합니다."
     )
 
-    analyzer = VeteranVCAnalyzer()
+    rubric = st.sidebar.selectbox("분석 모드", RUBRICS, format_func=lambda r: r.name)
+    analyzer = Analyzer(rubric)
+
+    # 분석이 진행 중이면 새 작업을 제출하지 않음 (이전 작업이 핸들 없이 토큰을 계속 쓰는 것을 방지)
+    future = st.session_state.get("analysis_future")
+    analysis_pending = future is not None and not future.done()
 
-    if st.button("🚀 심층 투자 분석 시작", type="primary"):
+    if st.button("🚀 심층 투자 분석 시작", type="primary", disabled=analysis_pending):
         if uploaded_file is not None:
-            with st.spinner('🔬 베테랑 VC가 사업계획서를 정밀 분석 중...'):
-                # PDF 텍스트 추출
-                business_plan_text = analyzer.extract_text_from_pdf(uploaded_file)
-
-                if business_plan_text:
-                    # AI 피드백 생성
-                    feedback = analyzer.generate_ai_feedback(business_plan_text)
-
-                    if feedback:
-                        # 피드백 표시
-                        st.header("💡 투자 심층 분석 결과")
-                        st.markdown(feedback)
-
-                        st.markdown("---")
-
-                        # 점수 추출 및 시각화
-                        st.header("📊 다차원 투자 평가")
-                        scores = analyzer.parse_detailed_scores(feedback)
-
-                        if scores:
-                            analyzer.visualize_scores(scores)
-                        else:
-                            st.warning("점수 추출에 실패했습니다.")
-                    else:
-                        st.error("AI 분석 중 오류가 발생했습니다.")
-                else:
-                    st.warning("PDF에서 텍스트를 추출하지 못했습니다.")
+            file_bytes = uploaded_file.getvalue()
+            if len(file_bytes) > MAX_PDF_BYTES:
+                st.error("25MB 초과 PDF는 지원되지 않습니다.")
+            else:
+                # 분석은 백그라운드 스레드에서 실행하고, 결과는 재실행(rerun) 시 폴링
+                progress = {'parts': [], 'cancel': threading.Event()}
+                st.session_state["analysis_progress"] = progress
+                st.session_state["analysis_file_id"] = uploaded_file.file_id
+                st.session_state["analysis_future"] = get_executor().submit(
+                    analyzer.run_pipeline, file_bytes, progress
+                )
         else:
             st.warning("📋 먼저 PDF 파일을 업로드해주세요.")
 
+    future = st.session_state.get("analysis_future")
+    if future is not None:
+        progress = st.session_state["analysis_progress"]
+        if future.done() and progress['cancel'].is_set():
+            # 취소된 작업의 결과는 버림
+            del st.session_state["analysis_future"]
+            st.info("분석이 취소되었습니다.")
+        elif future.done():
+            # 완료된 결과는 세션 상태에 보관해 이후 재실행에서 LLM을 다시 호출하지 않도록 함
+            result = future.result()
+            del st.session_state["analysis_future"]
+            if 'error' in result:
+                st.error(result['error'])
+            if 'warning' in result:
+                st.warning(result['warning'])
+            if result.get('feedback'):
+                st.session_state.feedback = result['feedback']
+                st.session_state.scores = analyzer.parse_detailed_scores(result['feedback'])
+                st.session_state.last_file_id = st.session_state["analysis_file_id"]
+        elif progress['cancel'].is_set():
+            # 작업 스레드가 스트림을 닫고 끝날 때까지 시작 버튼은 비활성 상태로 유지
+            st.info("분석을 취소하는 중입니다...")
+            time.sleep(1)
+            st.rerun()
+        elif st.button("⏹ 분석 취소"):
+            # 실행 중인 작업은 future.cancel()로 멈출 수 없으므로 이벤트로 스트리밍 중단을 요청
+            progress['cancel'].set()
+            future.cancel()
+            st.rerun()
+        else:
+            st.info('🔬 베테랑 VC가 사업계획서를 정밀 분석 중...')
+            st.header("💡 투자 심층 분석 결과")
+            # JSON 응답에서 종합 평가(overall) 부분만 읽을 수 있는 형태로 미리 보여줌
+            partial = "".join(progress['parts'])
+            overall = partial_overall(partial)
+            if overall:
+                st.markdown(overall)
+            if '"scores"' in partial:
+                st.caption(f"영역별 점수를 작성하는 중입니다... ({len(partial):,}자 수신)")
+            elif not overall:
+                st.caption(f"종합 평가를 작성하는 중입니다... ({len(partial):,}자 수신)")
+            time.sleep(1)
+            st.rerun()
+
+    # 다른 파일이 업로드되면 이전 분석 결과는 무효화
+    if uploaded_file is not None and uploaded_file.file_id != st.session_state.get("last_file_id"):
+        for key in ("feedback", "scores", "last_file_id"):
+            st.session_state.pop(key, None)
+
+    feedback = st.session_state.get("feedback")
+    scores = st.session_state.get("scores")
+    if feedback:
+        render_analysis_result(analyzer, feedback, scores)
+
     # 앱 하단 정보
     st.markdown("---")
     st.caption("Advanced Investment Analysis Platform powered by Streamlit, OpenAI GPT-4, PyMuPDF, Plotly")